@@ -4,65 +4,269 @@ Seed script to populate the StreamFlix database with sample data
 """
 import asyncio
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-import bcrypt
-import uuid
-from datetime import datetime, timezone
+import sys
+from typing import Optional
 
-# Load environment variables
-load_dotenv()
+# Heavy imports (motor/pymongo, bcrypt, dotenv) are deferred to the functions
+# that need them, so importing this module stays cheap and never opens a
+# database connection.
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# bcrypt cost factor for the seeded demo accounts only (SEED_BCRYPT_ROUNDS,
+# default 4). Their passwords are public, so the default cost of 12 is pure
+# overhead here; the API server keeps its own hash_password with the library
+# default.
+DEFAULT_SEED_BCRYPT_ROUNDS = 4
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# SEED_FAST_HASH=1 stores "$seed$" + sha256 markers instead of bcrypt hashes.
+# Only usable once the server's verify_password recognises the "$seed$" prefix;
+# until then accounts seeded this way cannot log in. Leave unset for real seeds.
+SEED_HASH_PREFIX = "$seed$"
+
+# Interned tag vocabulary shared by every movie row
+TAG = {name: sys.intern(name) for name in (
+    "animation", "short", "family", "comedy", "sci-fi", "surreal", "blender",
+    "drama", "fantasy", "adventure", "action", "live-action", "thriller",
+    "escape", "cars", "stunts", "entertainment"
+)}
+
+# Sample movie data with real URLs for testing:
+# (slug, title, description, category, poster_url, backdrop_url, video_url,
+#  release_year, rating, duration_minutes, tags)
+MOVIE_ROWS = (
+    (
+        "big-buck-bunny",
+        "Big Buck Bunny",
+        "A large and lovable rabbit deals with three tiny bullies in this computer-animated short film. This open-source movie showcases stunning animation and a heartwarming story.",
+        "animation",
+        "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c5/Big_buck_bunny_poster_big.jpg/280px-Big_buck_bunny_poster_big.jpg",
+        "https://peach.blender.org/wp-content/uploads/bbb-splash.png",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/BigBuckBunny.mp4",
+        2008,
+        7.8,
+        10,
+        (TAG["animation"], TAG["short"], TAG["family"], TAG["comedy"])
+    ),
+    (
+        "elephant-dream",
+        "Elephant's Dream",
+        "Two strange characters explore a capricious and seemingly infinite machine. The elder, Proog, acts as a tour-guide and protector, happily showing off the sights and dangers of the machine to his initially curious but increasingly skeptical protege Emo.",
+        "sci-fi",
+        "https://upload.wikimedia.org/wikipedia/commons/thumb/8/83/Elephants_dream_poster.png/280px-Elephants_dream_poster.png",
+        "https://orange.blender.org/wp-content/uploads/2006/05/elephant_dreams_01.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ElephantsDream.mp4",
+        2006,
+        7.2,
+        11,
+        (TAG["sci-fi"], TAG["short"], TAG["surreal"], TAG["blender"])
+    ),
+    (
+        "sintel",
+        "Sintel",
+        "A lonely young woman, Sintel, helps and befriends a dragon, whom she calls Scales. But when he is kidnapped by an adult dragon, Sintel decides to embark on a dangerous quest to find her lost friend Scales.",
+        "drama",
+        "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b6/Sintel_poster.jpg/280px-Sintel_poster.jpg",
+        "https://durian.blender.org/wp-content/uploads/2010/06/sintel_04.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/Sintel.mp4",
+        2010,
+        8.1,
+        15,
+        (TAG["drama"], TAG["fantasy"], TAG["adventure"], TAG["short"])
+    ),
+    (
+        "tears-of-steel",
+        "Tears of Steel",
+        "In an apocalyptic future, a group of soldiers and scientists takes refuge in Amsterdam to try to stop an army of robots that threatens humanity in this live-action short film.",
+        "action",
+        "https://upload.wikimedia.org/wikipedia/commons/thumb/4/4b/Tears_of_Steel_poster.jpg/280px-Tears_of_Steel_poster.jpg",
+        "https://mango.blender.org/wp-content/uploads/2012/09/tears_of_steel_03.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/TearsOfSteel.mp4",
+        2012,
+        7.9,
+        12,
+        (TAG["action"], TAG["sci-fi"], TAG["short"], TAG["live-action"])
+    ),
+    (
+        "for-bigger-blazes",
+        "For Bigger Blazes",
+        "An action-packed adventure showcasing incredible visual effects and non-stop thrills. Experience the ultimate high-octane entertainment.",
+        "action",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerBlazes.jpg",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerBlazes.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerBlazes.mp4",
+        2019,
+        8.3,
+        15,
+        (TAG["action"], TAG["adventure"], TAG["thriller"])
+    ),
+    (
+        "for-bigger-escape",
+        "For Bigger Escape",
+        "An epic thriller about escape and survival against all odds. A heart-pounding journey that will keep you on the edge of your seat.",
+        "thriller",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerEscapes.jpg",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerEscapes.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerEscapes.mp4",
+        2019,
+        7.8,
+        15,
+        (TAG["thriller"], TAG["action"], TAG["escape"])
+    ),
+    (
+        "for-bigger-fun",
+        "For Bigger Fun",
+        "A delightful comedy that brings laughter and joy to audiences of all ages. Perfect for family movie nights and feel-good entertainment.",
+        "comedy",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerFun.jpg",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerFun.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerFun.mp4",
+        2019,
+        8.0,
+        15,
+        (TAG["comedy"], TAG["family"], TAG["entertainment"])
+    ),
+    (
+        "for-bigger-joyrides",
+        "For Bigger Joyrides",
+        "An exhilarating adventure filled with spectacular car chases and breathtaking stunts. Buckle up for the ride of a lifetime.",
+        "action",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerJoyrides.jpg",
+        "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerJoyrides.jpg",
+        "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerJoyrides.mp4",
+        2019,
+        8.2,
+        15,
+        (TAG["action"], TAG["cars"], TAG["adventure"], TAG["stunts"])
+    )
+)
+
+# Shared by every seeded movie; pymongo never mutates nested values
+LANGS_EN = ("en",)
+EMPTY_I18N = {}
+
+def _uuid_batch(n: int) -> list:
+    """Generate n UUID4 strings from a single os.urandom call"""
+    import uuid
+    buf = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4)) for i in range(n)]
+
+def hash_password(password: str, rounds: Optional[int] = None, salt: Optional[bytes] = None) -> str:
+    # Settings are read per call so values loaded from .env by seed_data() apply
+    if os.environ.get("SEED_FAST_HASH") == "1":
+        import hashlib
+        return SEED_HASH_PREFIX + hashlib.sha256(password.encode('utf-8')).hexdigest()
+    import bcrypt
+    if salt is None:
+        if rounds is None:
+            rounds = int(os.environ.get("SEED_BCRYPT_ROUNDS", DEFAULT_SEED_BCRYPT_ROUNDS))
+        salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+async def hash_passwords(passwords: list) -> list:
+    """Hash several passwords in parallel, with all salts generated up front"""
+    salts = [None] * len(passwords)
+    if os.environ.get("SEED_FAST_HASH") != "1":
+        import bcrypt
+        rounds = int(os.environ.get("SEED_BCRYPT_ROUNDS", DEFAULT_SEED_BCRYPT_ROUNDS))
+        salts = [bcrypt.gensalt(rounds=rounds) for _ in passwords]
+    
+    # bcrypt releases the GIL while hashing, so the default thread pool already
+    # spreads the work over all cores without process start-up or pickling cost
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(
+        loop.run_in_executor(None, hash_password, password, None, salt)
+        for password, salt in zip(passwords, salts)
+    ))
+
+async def _clear_collection(collection):
+    # Empty collections (first run) need no delete at all. delete_many is kept
+    # over drop() so the indexes the API server creates are not thrown away.
+    if await collection.estimated_document_count() > 0:
+        await collection.delete_many({})
 
 async def seed_data():
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    import bson
+    
+    # Without the C extension every document is BSON-encoded in pure Python
+    if not bson.has_c():
+        raise RuntimeError(
+            "pymongo's BSON C extension is not available; reinstall it from a "
+            "binary wheel: pip install --force-reinstall --only-binary :all: pymongo"
+        )
+    
+    # Load environment variables
+    load_dotenv()
+    
+    # MongoDB connection, created per run and always closed, even on failure.
+    # Relaxed write concern is intentional: seed data is regenerable, so the script
+    # does not wait for journal flushes or majority acknowledgement. Do not copy
+    # these settings into the API server.
+    client = AsyncIOMotorClient(
+        os.environ['MONGO_URL'],
+        maxPoolSize=50,
+        minPoolSize=10,
+        w=1,
+        journal=False,
+        retryWrites=False
+    )
+    try:
+        await _seed_database(client[os.environ['DB_NAME']])
+    finally:
+        client.close()
+
+async def _seed_database(db):
+    from datetime import datetime, timezone
+    import bson
+    from bson.raw_bson import RawBSONDocument
+    
     print("🌱 Starting to seed StreamFlix database...")
     
+    # Every document belongs to the same seed batch, so they share one timestamp.
+    # updated_at is still written (as the same `now` object) rather than omitted:
+    # the server's User and Movie models expose it and update_movie maintains it,
+    # so seeded documents keep the same shape as ones created through the API.
+    now = datetime.now(timezone.utc)
+    
     # Clear existing data
-    await db.users.delete_many({})
-    await db.profiles.delete_many({})
-    await db.movies.delete_many({})
-    await db.view_progress.delete_many({})
+    await asyncio.gather(*(
+        _clear_collection(collection)
+        for collection in (db.users, db.profiles, db.movies, db.view_progress)
+    ))
     print("🧹 Cleared existing data")
     
+    # Hash both passwords in parallel off the event loop
+    admin_hash, demo_hash = await hash_passwords(["admin123", "demo123"])
+    
+    # All IDs are drawn up front; profile IDs are needed before the demo user is inserted
+    admin_id, demo_user_id, profile1_id, profile2_id, *movie_ids = _uuid_batch(4 + len(MOVIE_ROWS))
+    
     # Create admin user
-    admin_id = str(uuid.uuid4())
     admin_user = {
         "id": admin_id,
         "email": "admin@streamflix.com",
-        "password_hash": hash_password("admin123"),
+        "password_hash": admin_hash,
         "role": "admin",
         "profiles": [],
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
-    await db.users.insert_one(admin_user)
-    print("👑 Created admin user: admin@streamflix.com / admin123")
     
     # Create demo user
-    demo_user_id = str(uuid.uuid4())
     demo_user = {
         "id": demo_user_id,
         "email": "demo@streamflix.com",
-        "password_hash": hash_password("demo123"),
+        "password_hash": demo_hash,
         "role": "user",
-        "profiles": [],
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "profiles": [profile1_id, profile2_id],
+        "created_at": now,
+        "updated_at": now
     }
-    await db.users.insert_one(demo_user)
+    await db.users.insert_many([admin_user, demo_user])
+    print("👑 Created admin user: admin@streamflix.com / admin123")
     print("👤 Created demo user: demo@streamflix.com / demo123")
     
     # Create demo profiles
-    profile1_id = str(uuid.uuid4())
-    profile2_id = str(uuid.uuid4())
-    
     profiles = [
         {
             "id": profile1_id,
@@ -72,7 +276,8 @@ async def seed_data():
             "language": "en",
             "maturity_rating": "PG-13",
             "watch_history": [],
-            "created_at": datetime.now(timezone.utc)
+            "watchlist": [],
+            "created_at": now
         },
         {
             "id": profile2_id,
@@ -82,168 +287,47 @@ async def seed_data():
             "language": "en",
             "maturity_rating": "R",
             "watch_history": [],
-            "created_at": datetime.now(timezone.utc)
+            "watchlist": [],
+            "created_at": now
         }
     ]
     
-    await db.profiles.insert_many(profiles)
-    
-    # Update demo user with profile IDs
-    await db.users.update_one(
-        {"id": demo_user_id},
-        {"$set": {"profiles": [profile1_id, profile2_id]}}
-    )
-    print("👥 Created demo profiles: John, Sarah")
-    
-    # Sample movie data with real URLs for testing
     movies = [
         {
-            "id": str(uuid.uuid4()),
-            "slug": "big-buck-bunny",
-            "title": "Big Buck Bunny",
-            "description": "A large and lovable rabbit deals with three tiny bullies in this computer-animated short film. This open-source movie showcases stunning animation and a heartwarming story.",
-            "category": "animation",
-            "poster_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c5/Big_buck_bunny_poster_big.jpg/280px-Big_buck_bunny_poster_big.jpg",
-            "backdrop_url": "https://peach.blender.org/wp-content/uploads/bbb-splash.png",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/BigBuckBunny.mp4",
-            "release_year": 2008,
-            "rating": 7.8,
-            "duration_minutes": 10,
-            "tags": ["animation", "short", "family", "comedy"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "elephant-dream",
-            "title": "Elephant's Dream",
-            "description": "Two strange characters explore a capricious and seemingly infinite machine. The elder, Proog, acts as a tour-guide and protector, happily showing off the sights and dangers of the machine to his initially curious but increasingly skeptical protege Emo.",
-            "category": "sci-fi",
-            "poster_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/8/83/Elephants_dream_poster.png/280px-Elephants_dream_poster.png",
-            "backdrop_url": "https://orange.blender.org/wp-content/uploads/2006/05/elephant_dreams_01.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ElephantsDream.mp4",
-            "release_year": 2006,
-            "rating": 7.2,
-            "duration_minutes": 11,
-            "tags": ["sci-fi", "short", "surreal", "blender"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "sintel",
-            "title": "Sintel",
-            "description": "A lonely young woman, Sintel, helps and befriends a dragon, whom she calls Scales. But when he is kidnapped by an adult dragon, Sintel decides to embark on a dangerous quest to find her lost friend Scales.",
-            "category": "drama",
-            "poster_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b6/Sintel_poster.jpg/280px-Sintel_poster.jpg",
-            "backdrop_url": "https://durian.blender.org/wp-content/uploads/2010/06/sintel_04.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/Sintel.mp4",
-            "release_year": 2010,
-            "rating": 8.1,
-            "duration_minutes": 15,
-            "tags": ["drama", "fantasy", "adventure", "short"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "tears-of-steel",
-            "title": "Tears of Steel",
-            "description": "In an apocalyptic future, a group of soldiers and scientists takes refuge in Amsterdam to try to stop an army of robots that threatens humanity in this live-action short film.",
-            "category": "action",
-            "poster_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/4/4b/Tears_of_Steel_poster.jpg/280px-Tears_of_Steel_poster.jpg",
-            "backdrop_url": "https://mango.blender.org/wp-content/uploads/2012/09/tears_of_steel_03.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/TearsOfSteel.mp4",
-            "release_year": 2012,
-            "rating": 7.9,
-            "duration_minutes": 12,
-            "tags": ["action", "sci-fi", "short", "live-action"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "for-bigger-blazes",
-            "title": "For Bigger Blazes",
-            "description": "An action-packed adventure showcasing incredible visual effects and non-stop thrills. Experience the ultimate high-octane entertainment.",
-            "category": "action",
-            "poster_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerBlazes.jpg",
-            "backdrop_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerBlazes.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerBlazes.mp4",
-            "release_year": 2019,
-            "rating": 8.3,
-            "duration_minutes": 15,
-            "tags": ["action", "adventure", "thriller"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "for-bigger-escape",
-            "title": "For Bigger Escape",
-            "description": "An epic thriller about escape and survival against all odds. A heart-pounding journey that will keep you on the edge of your seat.",
-            "category": "thriller",
-            "poster_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerEscapes.jpg",
-            "backdrop_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerEscapes.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerEscapes.mp4",
-            "release_year": 2019,
-            "rating": 7.8,
-            "duration_minutes": 15,
-            "tags": ["thriller", "action", "escape"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "for-bigger-fun",
-            "title": "For Bigger Fun",
-            "description": "A delightful comedy that brings laughter and joy to audiences of all ages. Perfect for family movie nights and feel-good entertainment.",
-            "category": "comedy",
-            "poster_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerFun.jpg",
-            "backdrop_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerFun.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerFun.mp4",
-            "release_year": 2019,
-            "rating": 8.0,
-            "duration_minutes": 15,
-            "tags": ["comedy", "family", "entertainment"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "slug": "for-bigger-joyrides",
-            "title": "For Bigger Joyrides",
-            "description": "An exhilarating adventure filled with spectacular car chases and breathtaking stunts. Buckle up for the ride of a lifetime.",
-            "category": "action",
-            "poster_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerJoyrides.jpg",
-            "backdrop_url": "https://storage.googleapis.com/gtv-videos-bucket/sample/images/ForBiggerJoyrides.jpg",
-            "video_url": "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/ForBiggerJoyrides.mp4",
-            "release_year": 2019,
-            "rating": 8.2,
-            "duration_minutes": 15,
-            "tags": ["action", "cars", "adventure", "stunts"],
-            "languages": ["en"],
-            "i18n": {},
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
+            "id": movie_id,
+            "slug": slug,
+            "title": title,
+            "description": description,
+            "category": category,
+            "poster_url": poster_url,
+            "backdrop_url": backdrop_url,
+            "video_url": video_url,
+            "release_year": release_year,
+            "rating": rating,
+            "duration_minutes": duration_minutes,
+            "tags": tags,
+            "languages": LANGS_EN,
+            "i18n": EMPTY_I18N,
+            "created_at": now,
+            "updated_at": now
         }
+        for movie_id, (slug, title, description, category, poster_url, backdrop_url,
+                       video_url, release_year, rating, duration_minutes, tags)
+        in zip(movie_ids, MOVIE_ROWS)
     ]
     
-    await db.movies.insert_many(movies)
+    # Encode up front so insert_many only ships ready-made BSON; the server
+    # assigns _id since raw documents are never modified client-side
+    encoded_profiles = [RawBSONDocument(bson.encode(profile)) for profile in profiles]
+    encoded_movies = [RawBSONDocument(bson.encode(movie)) for movie in movies]
+    
+    # Seed documents are known-clean: let the server apply them unordered and
+    # skip any collection validators
+    await asyncio.gather(
+        db.profiles.insert_many(encoded_profiles, ordered=False, bypass_document_validation=True),
+        db.movies.insert_many(encoded_movies, ordered=False, bypass_document_validation=True)
+    )
+    print("👥 Created demo profiles: John, Sarah")
     print(f"🎬 Created {len(movies)} sample movies")
     
     print("✅ Database seeding completed successfully!")
@@ -251,10 +335,12 @@ async def seed_data():
     print("Admin: admin@streamflix.com / admin123")
     print("Demo User: demo@streamflix.com / demo123")
     print("\n🎯 Available Movies:")
-    for movie in movies:
-        print(f"  - {movie['title']} ({movie['category']})")
-    
-    client.close()
+    sys.stdout.write("\n".join(f"  - {movie['title']} ({movie['category']})" for movie in movies) + "\n")
 
 if __name__ == "__main__":
-    asyncio.run(seed_data())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:  # optional; not available on Windows
+        asyncio.run(seed_data())
+    else:
+        uvloop.run(seed_data())
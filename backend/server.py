@@ -1,25 +1,47 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
+import asyncio
+import hashlib
 import logging
+import re
+import time
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
+from typing import List, Literal, Optional, Dict, Any, Union
 import uuid
+import orjson
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import jwt
-from enum import Enum
+from enum import StrEnum
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Keep a warm pool so bursts don't pay connection setup, and compress wire
+# traffic (zstd, falling back to zlib) since list responses are the bulk of it
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=200,
+    minPoolSize=20,
+    maxIdleTimeMS=300_000,
+    serverSelectionTimeoutMS=2000,
+    compressors="zstd,zlib"
+)
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
@@ -27,29 +49,73 @@ JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production'
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+# Encoded once instead of on every sign/verify; the decoder requires exp and sub
+JWT_KEY = JWT_SECRET.encode('utf-8')
+jwt_decoder = jwt.PyJWT(options={"require": ["exp", "sub"]})
 
 # Security
 security = HTTPBearer()
 
+# New passwords are hashed with Argon2id; bcrypt hashes from existing and
+# seeded accounts are still verified
+password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=1)
+
+# Password hashing is CPU-bound but releases the GIL, so running it on this pool
+# keeps the event loop free and lets concurrent logins use every core. uvicorn
+# takes its worker count from WEB_CONCURRENCY; each worker gets its share of the
+# cores so a login burst runs at most cpu_count 64 MiB Argon2 hashes in total
+api_workers = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+password_pool = ThreadPoolExecutor(
+    max_workers=max(1, (os.cpu_count() or 1) // api_workers), thread_name_prefix="password"
+)
+
+# Authenticated users keyed by bearer token, so steady-state requests skip the
+# users lookup. user_cache_tokens maps user_id -> tokens for invalidation when
+# the user document changes; it expires with the tokens it indexes, since
+# cache_user re-sets it whenever a token is added.
+user_cache = TTLCache(maxsize=10_000, ttl=60)
+user_cache_tokens = TTLCache(maxsize=10_000, ttl=60)
+
+# (user_id, profile_id, movie_id) triples already checked by update_view_progress,
+# so playback ticks for the same movie skip the profile and movie lookups
+view_progress_guard = TTLCache(maxsize=50_000, ttl=120)
+
+# List endpoints return stored documents as-is (they already match the
+# response models), skipping per-item Pydantic validation; Mongo's _id is
+# projected away since it is not part of the API
+NO_MONGO_ID = {"_id": 0}
+MOVIE_CARD_PROJECTION = {
+    "_id": 0, "id": 1, "slug": 1, "title": 1, "category": 1,
+    "poster_url": 1, "release_year": 1, "rating": 1
+}
+
 # Create the main app
-app = FastAPI(title="StreamFlix API", description="Netflix-like streaming platform API")
+app = FastAPI(
+    title="StreamFlix API",
+    description="Netflix-like streaming platform API",
+    default_response_class=ORJSONResponse
+)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 # Enums
-class UserRole(str, Enum):
+class UserRole(StrEnum):
     USER = "user"
     ADMIN = "admin"
 
-class MaturityRating(str, Enum):
+class MaturityRating(StrEnum):
     G = "G"
     PG = "PG" 
     PG13 = "PG-13"
     R = "R"
     NC17 = "NC-17"
 
-class MovieCategory(str, Enum):
+class MovieListView(StrEnum):
+    FULL = "full"
+    CARD = "card"
+
+class MovieCategory(StrEnum):
     ACTION = "action"
     COMEDY = "comedy"
     DRAMA = "drama"
@@ -61,15 +127,25 @@ class MovieCategory(str, Enum):
     ANIMATION = "animation"
     FAMILY = "family"
 
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 # Pydantic Models
-class User(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class StoredModel(BaseModel):
+    # Documents read back from Mongo carry _id and are never mutated in place
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+class User(StoredModel):
+    id: str = Field(default_factory=new_id)
     email: EmailStr
     password_hash: str
     role: UserRole = UserRole.USER
     profiles: List[str] = Field(default_factory=list)  # Profile IDs
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 class UserRegister(BaseModel):
     email: EmailStr
@@ -79,8 +155,8 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
-class Profile(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class Profile(StoredModel):
+    id: str = Field(default_factory=new_id)
     user_id: str
     name: str
     avatar: str = "default"
@@ -88,7 +164,7 @@ class Profile(BaseModel):
     maturity_rating: MaturityRating = MaturityRating.PG13
     watch_history: List[str] = Field(default_factory=list)  # Movie IDs
     watchlist: List[str] = Field(default_factory=list)  # Movie IDs in "My List"
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
 
 class ProfileCreate(BaseModel):
     name: str
@@ -103,8 +179,8 @@ class ProfileUpdate(BaseModel):
     maturity_rating: Optional[MaturityRating] = None
     watchlist: Optional[List[str]] = None
 
-class Movie(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class Movie(StoredModel):
+    id: str = Field(default_factory=new_id)
     slug: str
     title: str
     description: str
@@ -118,8 +194,18 @@ class Movie(BaseModel):
     tags: List[str] = Field(default_factory=list)
     languages: List[str] = Field(default_factory=list)
     i18n: Dict[str, Dict[str, str]] = Field(default_factory=dict)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+class MovieCard(BaseModel):
+    # Fields a list/grid view needs; returned by GET /movies?view=card
+    id: str
+    slug: str
+    title: str
+    category: MovieCategory
+    poster_url: str
+    release_year: int
+    rating: float
 
 class MovieCreate(BaseModel):
     slug: str
@@ -151,18 +237,25 @@ class MovieUpdate(BaseModel):
     languages: Optional[List[str]] = None
     i18n: Optional[Dict[str, Dict[str, str]]] = None
 
-class ViewProgress(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class ViewProgress(StoredModel):
+    id: str = Field(default_factory=new_id)
     profile_id: str
     movie_id: str
     progress_seconds: int
     completed: bool = False
-    last_watched: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    last_watched: datetime = Field(default_factory=utcnow)
 
 class ViewProgressUpdate(BaseModel):
     progress_seconds: int
     completed: bool = False
 
+class WatchlistOperation(BaseModel):
+    op: Literal["add", "remove", "check", "list"]
+    movie_id: Optional[str] = None
+
+class WatchlistBatch(BaseModel):
+    ops: List[WatchlistOperation]
+
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -170,26 +263,67 @@ class TokenResponse(BaseModel):
 
 # Utility functions
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return password_hasher.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    if hashed.startswith("$argon2"):
+        try:
+            return password_hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        # Unrecognised hash format (e.g. the seed script's "$seed$" marker):
+        # a failed login, not a server error
+        return False
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+async def run_in_password_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(password_pool, func, *args)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    expire = utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "type": "access"})
+    return jwt.encode(to_encode, JWT_KEY, algorithm=JWT_ALGORITHM)
 
 def create_refresh_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    # The role claim is only trusted on short-lived access tokens
+    to_encode = {key: value for key, value in data.items() if key != "role"}
+    expire = utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt.encode(to_encode, JWT_KEY, algorithm=JWT_ALGORITHM)
+
+def cache_user(token: str, user: User, expires_at: float):
+    user_cache[token] = (user, expires_at)
+    tokens = user_cache_tokens.get(user.id, set())
+    # Drop tokens the TTL cache has already evicted
+    tokens = {t for t in tokens if t in user_cache}
+    tokens.add(token)
+    user_cache_tokens[user.id] = tokens
+
+def invalidate_cached_user(user_id: str):
+    for token in user_cache_tokens.pop(user_id, ()):
+        user_cache.pop(token, None)
+
+def invalidate_view_progress_guard(predicate):
+    for key in [key for key in view_progress_guard if predicate(key)]:
+        view_progress_guard.pop(key, None)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    cached = user_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt_decoder.decode(token, JWT_KEY, algorithms=[JWT_ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
@@ -198,16 +332,28 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         
-        return User(**user)
+        current_user = User(**user)
+        cache_user(token, current_user, payload["exp"])
+        return current_user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-async def get_admin_user(current_user: User = Depends(get_current_user)):
-    if current_user.role != UserRole.ADMIN:
+async def require_admin(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    # The role is carried in the access token, so admin checks need no users
+    # lookup; a role change takes effect within the access token's 30 minutes.
+    # Refresh tokens live for days and carry no role, so they are rejected here.
+    try:
+        payload = jwt_decoder.decode(credentials.credentials, JWT_KEY, algorithms=[JWT_ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    if payload.get("type") != "access" or payload.get("role") != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
-    return current_user
+    return payload["sub"]
 
 # Authentication Routes
 @api_router.post("/auth/register", response_model=TokenResponse)
@@ -217,28 +363,40 @@ async def register(user_data: UserRegister):
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Create user
-    user = User(
-        email=user_data.email,
-        password_hash=hash_password(user_data.password)
-    )
-    
-    await db.users.insert_one(user.dict())
+    # Create user; the document is written directly since only tokens are returned
+    now = utcnow()
+    user_id = new_id()
+    password_hash = await run_in_password_pool(hash_password, user_data.password)
+    # The unique email index catches a concurrent registration that passed the check above
+    try:
+        await db.users.insert_one({
+            "id": user_id,
+            "email": user_data.email,
+            "password_hash": password_hash,
+            "role": UserRole.USER.value,
+            "profiles": [],
+            "created_at": now,
+            "updated_at": now
+        })
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create tokens
-    access_token = create_access_token(data={"sub": user.id})
-    refresh_token = create_refresh_token(data={"sub": user.id})
+    token_data = {"sub": user_id, "role": UserRole.USER.value}
+    access_token = create_access_token(data=token_data)
+    refresh_token = create_refresh_token(data=token_data)
     
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(user_data: UserLogin):
     user = await db.users.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user["password_hash"]):
+    if not user or not await run_in_password_pool(verify_password, user_data.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    access_token = create_access_token(data={"sub": user["id"]})
-    refresh_token = create_refresh_token(data={"sub": user["id"]})
+    token_data = {"sub": user["id"], "role": user.get("role", UserRole.USER.value)}
+    access_token = create_access_token(data=token_data)
+    refresh_token = create_refresh_token(data=token_data)
     
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
@@ -249,37 +407,44 @@ async def get_me(current_user: User = Depends(get_current_user)):
 # Profile Routes
 @api_router.get("/profiles", response_model=List[Profile])
 async def get_profiles(current_user: User = Depends(get_current_user)):
-    profiles = await db.profiles.find({"user_id": current_user.id}).to_list(length=None)
-    return [Profile(**profile) for profile in profiles]
+    profiles = await db.profiles.find({"user_id": current_user.id}, NO_MONGO_ID).to_list(length=None)
+    # Profiles seeded before the watchlist feature have no field for it
+    for profile in profiles:
+        profile.setdefault("watchlist", [])
+    return ORJSONResponse(profiles)
 
 @api_router.post("/profiles", response_model=Profile)
 async def create_profile(profile_data: ProfileCreate, current_user: User = Depends(get_current_user)):
     profile = Profile(
         user_id=current_user.id,
-        **profile_data.dict()
+        **profile_data.model_dump()
     )
     
-    await db.profiles.insert_one(profile.dict())
+    await db.profiles.insert_one(profile.model_dump())
     
     # Add profile ID to user's profiles list
     await db.users.update_one(
         {"id": current_user.id},
         {"$push": {"profiles": profile.id}}
     )
+    invalidate_cached_user(current_user.id)
     
     return profile
 
 @api_router.put("/profiles/{profile_id}", response_model=Profile)
 async def update_profile(profile_id: str, profile_data: ProfileUpdate, current_user: User = Depends(get_current_user)):
-    profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id})
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    update_data = {k: v for k, v in profile_data.dict().items() if v is not None}
+    query = {"id": profile_id, "user_id": current_user.id}
+    update_data = profile_data.model_dump(exclude_none=True)
     if update_data:
-        await db.profiles.update_one({"id": profile_id}, {"$set": update_data})
+        updated_profile = await db.profiles.find_one_and_update(
+            query, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
+    else:
+        updated_profile = await db.profiles.find_one(query)
+    
+    if not updated_profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
     
-    updated_profile = await db.profiles.find_one({"id": profile_id})
     return Profile(**updated_profile)
 
 @api_router.delete("/profiles/{profile_id}")
@@ -293,16 +458,20 @@ async def delete_profile(profile_id: str, current_user: User = Depends(get_curre
         {"id": current_user.id},
         {"$pull": {"profiles": profile_id}}
     )
+    invalidate_cached_user(current_user.id)
+    invalidate_view_progress_guard(lambda key: key[1] == profile_id)
     
     return {"message": "Profile deleted successfully"}
 
 # Movie Routes
-@api_router.get("/movies", response_model=List[Movie])
+@api_router.get("/movies", response_model=Union[List[Movie], List[MovieCard]])
 async def get_movies(
     category: Optional[MovieCategory] = None,
     year: Optional[int] = None,
     search: Optional[str] = None,
-    limit: int = 50
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    view: MovieListView = MovieListView.FULL
 ):
     query = {}
     
@@ -310,57 +479,74 @@ async def get_movies(
         query["category"] = category
     if year:
         query["release_year"] = year
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
-        ]
     
-    movies = await db.movies.find(query).limit(limit).to_list(length=None)
-    return [Movie(**movie) for movie in movies]
+    projection = MOVIE_CARD_PROJECTION if view == MovieListView.CARD else NO_MONGO_ID
+    if search:
+        # Whole words are served by the title/description text index created at
+        # startup, best matches first; sorting on textScore does not require projecting it
+        text_query = {**query, "$text": {"$search": search}}
+        cursor = db.movies.find(text_query, projection).sort([("score", {"$meta": "textScore"})])
+        movies = await cursor.skip(offset).limit(limit).to_list(length=None)
+        # An empty page past the last text match is still a text result
+        if movies or (offset and await db.movies.find_one(text_query, {"_id": 1})):
+            return ORJSONResponse(movies)
+        # The text index only matches whole (stemmed) words, so partial input typed
+        # into the search box ("Bun", "Sint") falls back to a prefix match on title words
+        query["title"] = {"$regex": r"\b" + re.escape(search), "$options": "i"}
+    
+    movies = await db.movies.find(query, projection).skip(offset).limit(limit).to_list(length=None)
+    return ORJSONResponse(movies)
 
 @api_router.get("/movies/{movie_id}", response_model=Movie)
-async def get_movie(movie_id: str):
+async def get_movie(movie_id: str, request: Request, response: Response):
     movie = await db.movies.find_one({"$or": [{"id": movie_id}, {"slug": movie_id}]})
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
     
+    # update_movie bumps updated_at on every change, so it versions the document
+    etag = f'W/"{movie["id"]}-{int(movie["updated_at"].timestamp() * 1000)}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
     return Movie(**movie)
 
 @api_router.post("/movies", response_model=Movie)
-async def create_movie(movie_data: MovieCreate, admin_user: User = Depends(get_admin_user)):
-    # Check for duplicate slug
-    existing_movie = await db.movies.find_one({"slug": movie_data.slug})
-    if existing_movie:
+async def create_movie(movie_data: MovieCreate, admin_id: str = Depends(require_admin)):
+    movie = Movie(**movie_data.model_dump())
+    # The unique slug index rejects duplicates atomically
+    try:
+        await db.movies.insert_one(movie.model_dump())
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Movie with this slug already exists")
     
-    movie = Movie(**movie_data.dict())
-    await db.movies.insert_one(movie.dict())
-    
     return movie
 
 @api_router.put("/movies/{movie_id}", response_model=Movie)
-async def update_movie(movie_id: str, movie_data: MovieUpdate, admin_user: User = Depends(get_admin_user)):
-    movie = await db.movies.find_one({"id": movie_id})
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
+async def update_movie(movie_id: str, movie_data: MovieUpdate, admin_id: str = Depends(require_admin)):
+    update_data = movie_data.model_dump(exclude_none=True)
+    update_data["updated_at"] = utcnow()
     
-    update_data = {k: v for k, v in movie_data.dict().items() if v is not None}
-    update_data["updated_at"] = datetime.now(timezone.utc)
-    
-    if update_data:
-        await db.movies.update_one({"id": movie_id}, {"$set": update_data})
+    try:
+        updated_movie = await db.movies.find_one_and_update(
+            {"id": movie_id}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Movie with this slug already exists")
+    if not updated_movie:
+        raise HTTPException(status_code=404, detail="Movie not found")
     
-    updated_movie = await db.movies.find_one({"id": movie_id})
     return Movie(**updated_movie)
 
 @api_router.delete("/movies/{movie_id}")
-async def delete_movie(movie_id: str, admin_user: User = Depends(get_admin_user)):
+async def delete_movie(movie_id: str, admin_id: str = Depends(require_admin)):
     movie = await db.movies.find_one({"id": movie_id})
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
     
     await db.movies.delete_one({"id": movie_id})
+    invalidate_view_progress_guard(lambda key: key[2] == movie_id)
     
     return {"message": "Movie deleted successfully"}
 
@@ -372,22 +558,26 @@ async def get_continue_watching(profile_id: str, current_user: User = Depends(ge
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    progress_list = await db.view_progress.find({
-        "profile_id": profile_id,
-        "completed": False,
-        "progress_seconds": {"$gt": 30}  # Only show if watched for more than 30 seconds
-    }).sort("last_watched", -1).to_list(length=10)
-    
-    result = []
-    for progress in progress_list:
-        movie = await db.movies.find_one({"id": progress["movie_id"]})
-        if movie:
-            result.append({
-                "movie": Movie(**movie),
-                "progress": ViewProgress(**progress)
-            })
-    
-    return result
+    # Join the movies server-side in one round-trip; $unwind drops progress
+    # entries whose movie no longer exists
+    progress_list = await db.view_progress.aggregate([
+        {"$match": {
+            "profile_id": profile_id,
+            "completed": False,
+            "progress_seconds": {"$gt": 30}  # Only show if watched for more than 30 seconds
+        }},
+        {"$sort": {"last_watched": -1}},
+        {"$limit": 10},
+        {"$lookup": {"from": "movies", "localField": "movie_id", "foreignField": "id", "as": "movie"}},
+        {"$unwind": "$movie"},
+        {"$project": {"_id": 0, "movie._id": 0}}
+    ]).to_list(length=None)
+    
+    # Stored docs are already in API shape; skip per-item model validation
+    return ORJSONResponse([
+        {"movie": progress.pop("movie"), "progress": progress}
+        for progress in progress_list
+    ])
 
 @api_router.put("/views/{movie_id}")
 async def update_view_progress(
@@ -396,102 +586,147 @@ async def update_view_progress(
     progress_data: ViewProgressUpdate,
     current_user: User = Depends(get_current_user)
 ):
-    # Verify profile belongs to user
-    profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id})
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    # Verify movie exists
-    movie = await db.movies.find_one({"id": movie_id})
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    
-    # Update or create progress
-    progress = await db.view_progress.find_one({
-        "profile_id": profile_id,
-        "movie_id": movie_id
-    })
-    
-    if progress:
-        await db.view_progress.update_one(
-            {"id": progress["id"]},
-            {
-                "$set": {
-                    "progress_seconds": progress_data.progress_seconds,
-                    "completed": progress_data.completed,
-                    "last_watched": datetime.now(timezone.utc)
-                }
-            }
-        )
-    else:
-        new_progress = ViewProgress(
-            profile_id=profile_id,
-            movie_id=movie_id,
-            progress_seconds=progress_data.progress_seconds,
-            completed=progress_data.completed
-        )
-        await db.view_progress.insert_one(new_progress.dict())
-    
-    # Add to watch history if not already there
-    if movie_id not in profile.get("watch_history", []):
-        await db.profiles.update_one(
-            {"id": profile_id},
-            {"$push": {"watch_history": movie_id}}
-        )
+    guard_key = (current_user.id, profile_id, movie_id)
+    if guard_key not in view_progress_guard:
+        # Verify profile belongs to user
+        profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id}, {"_id": 1})
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        
+        # Verify movie exists
+        movie = await db.movies.find_one({"id": movie_id}, {"_id": 1})
+        if not movie:
+            raise HTTPException(status_code=404, detail="Movie not found")
+        
+        view_progress_guard[guard_key] = True
+    
+    # Upsert the progress and record the watch history concurrently
+    await asyncio.gather(db.view_progress.update_one(
+        {"profile_id": profile_id, "movie_id": movie_id},
+        {
+            "$set": {
+                "progress_seconds": progress_data.progress_seconds,
+                "completed": progress_data.completed,
+                "last_watched": utcnow()
+            },
+            "$setOnInsert": {"id": str(uuid.uuid4())}
+        },
+        upsert=True
+    ), db.profiles.update_one(
+        {"id": profile_id},
+        {"$addToSet": {"watch_history": movie_id}}
+    ))
     
     return {"message": "Progress updated successfully"}
 
 # Watchlist Routes
-@api_router.get("/profiles/{profile_id}/watchlist", response_model=List[Movie])
-async def get_watchlist(profile_id: str, current_user: User = Depends(get_current_user)):
-    profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id})
+@api_router.api_route("/profiles/{profile_id}/watchlist", methods=["GET", "HEAD"], response_model=List[Movie])
+async def get_watchlist(profile_id: str, request: Request, current_user: User = Depends(get_current_user)):
+    profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id}, {"watchlist": 1})
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
     watchlist_ids = profile.get("watchlist", [])
-    if not watchlist_ids:
-        return []
+    headers = {"X-Watchlist-Count": str(len(watchlist_ids))}
+    # HEAD answers from the count header alone, without loading the movies
+    if request.method == "HEAD":
+        return Response(headers=headers)
+    
+    movies = []
+    if watchlist_ids:
+        movies = await db.movies.find({"id": {"$in": watchlist_ids}}, NO_MONGO_ID).to_list(length=None)
+    return ORJSONResponse(movies, headers=headers)
+
+async def watchlist_add(profile_filter: dict, movie_id: str) -> Optional[dict]:
+    # Ownership check and add in one atomic update; the pre-image tells whether
+    # the movie was already there. None when no profile matches profile_filter.
+    profile = await db.profiles.find_one_and_update(
+        profile_filter,
+        {"$addToSet": {"watchlist": movie_id}},
+        projection={"_id": 0, "watchlist": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not profile:
+        return None
     
-    movies = await db.movies.find({"id": {"$in": watchlist_ids}}).to_list(length=None)
-    return [Movie(**movie) for movie in movies]
-
-@api_router.post("/profiles/{profile_id}/watchlist/{movie_id}")
-async def add_to_watchlist(profile_id: str, movie_id: str, current_user: User = Depends(get_current_user)):
-    # Verify profile belongs to user
-    profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id})
+    watchlist = profile.get("watchlist", [])
+    was_new = movie_id not in watchlist
+    if was_new:
+        watchlist.append(movie_id)
+    message = "Added to watchlist" if was_new else "Already in watchlist"
+    return {"message": message, "watchlist": watchlist, "in_watchlist": True, "was_new": was_new}
+
+async def watchlist_remove(profile_filter: dict, movie_id: str) -> Optional[dict]:
+    profile = await db.profiles.find_one_and_update(
+        profile_filter,
+        {"$pull": {"watchlist": movie_id}},
+        projection={"_id": 0, "watchlist": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not profile:
+        return None
+    return {"message": "Removed from watchlist", "watchlist": profile.get("watchlist", []), "in_watchlist": False}
+
+# Declared before /watchlist/{movie_id} so "batch" is not taken as a movie id
+@api_router.post("/profiles/{profile_id}/watchlist/batch")
+async def batch_watchlist(profile_id: str, batch: WatchlistBatch, current_user: User = Depends(get_current_user)):
+    # Applies the ops in order through the same helpers as the single-op
+    # endpoints, so each result has the same shape as their response
+    profile_filter = {"id": profile_id, "user_id": current_user.id}
+    profile = await db.profiles.find_one(profile_filter, {"watchlist": 1})
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    if any(op.movie_id is None for op in batch.ops if op.op != "list"):
+        raise HTTPException(status_code=422, detail="movie_id is required for add, remove and check")
+    
+    # Reject unknown movies before any write so the batch is not half-applied
+    add_ids = {op.movie_id for op in batch.ops if op.op == "add"}
+    if add_ids and await db.movies.count_documents({"id": {"$in": list(add_ids)}}) != len(add_ids):
+        raise HTTPException(status_code=404, detail="Movie not found")
+    
+    # check and list read the watchlist as of the latest add/remove result
+    watchlist = profile.get("watchlist", [])
+    results = []
+    for op in batch.ops:
+        if op.op in ("add", "remove"):
+            apply = watchlist_add if op.op == "add" else watchlist_remove
+            result = await apply(profile_filter, op.movie_id)
+            if result is None:
+                # Deleted while the batch was running
+                raise HTTPException(status_code=404, detail="Profile not found")
+            watchlist = result["watchlist"]
+            results.append(result)
+        elif op.op == "check":
+            results.append({"in_watchlist": op.movie_id in watchlist})
+        else:
+            movies = []
+            if watchlist:
+                movies = await db.movies.find({"id": {"$in": watchlist}}, NO_MONGO_ID).to_list(length=None)
+            results.append(movies)
+    
+    return ORJSONResponse({"results": results})
+
+@api_router.post("/profiles/{profile_id}/watchlist/{movie_id}")
+async def add_to_watchlist(profile_id: str, movie_id: str, current_user: User = Depends(get_current_user)):
     # Verify movie exists
-    movie = await db.movies.find_one({"id": movie_id})
+    movie = await db.movies.find_one({"id": movie_id}, {"_id": 1})
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
     
-    # Add to watchlist if not already there
-    watchlist = profile.get("watchlist", [])
-    if movie_id not in watchlist:
-        await db.profiles.update_one(
-            {"id": profile_id},
-            {"$push": {"watchlist": movie_id}}
-        )
-        return {"message": "Added to watchlist"}
-    else:
-        return {"message": "Already in watchlist"}
+    result = await watchlist_add({"id": profile_id, "user_id": current_user.id}, movie_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return result
 
 @api_router.delete("/profiles/{profile_id}/watchlist/{movie_id}")
 async def remove_from_watchlist(profile_id: str, movie_id: str, current_user: User = Depends(get_current_user)):
-    # Verify profile belongs to user
-    profile = await db.profiles.find_one({"id": profile_id, "user_id": current_user.id})
-    if not profile:
+    result = await watchlist_remove({"id": profile_id, "user_id": current_user.id}, movie_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    # Remove from watchlist
-    await db.profiles.update_one(
-        {"id": profile_id},
-        {"$pull": {"watchlist": movie_id}}
-    )
-    
-    return {"message": "Removed from watchlist"}
+    return result
 
 @api_router.get("/profiles/{profile_id}/watchlist/check/{movie_id}")
 async def check_watchlist_status(profile_id: str, movie_id: str, current_user: User = Depends(get_current_user)):
@@ -503,86 +738,97 @@ async def check_watchlist_status(profile_id: str, movie_id: str, current_user: U
     return {"in_watchlist": movie_id in watchlist}
 
 # Translations Route
-@api_router.get("/translations")
-async def get_translations(lang: str = "en"):
-    translations = {
-        "en": {
-            "home": "Home",
-            "movies": "Movies",
-            "series": "TV Series",
-            "my_list": "My List",
-            "search": "Search",
-            "play": "Play",
-            "more_info": "More Info",
-            "continue_watching": "Continue Watching",
-            "popular": "Popular",
-            "trending": "Trending Now",
-            "new_releases": "New Releases",
-            "action": "Action",
-            "comedy": "Comedy",
-            "drama": "Drama",
-            "horror": "Horror",
-            "sci_fi": "Sci-Fi",
-            "romance": "Romance",
-            "thriller": "Thriller",
-            "documentary": "Documentary",
-            "animation": "Animation",
-            "family": "Family"
-        },
-        "es": {
-            "home": "Inicio",
-            "movies": "Películas",
-            "series": "Series de TV",
-            "my_list": "Mi Lista",
-            "search": "Buscar",
-            "play": "Reproducir",
-            "more_info": "Más Información",
-            "continue_watching": "Continuar Viendo",
-            "popular": "Popular",
-            "trending": "Tendencias",
-            "new_releases": "Nuevos Lanzamientos",
-            "action": "Acción",
-            "comedy": "Comedia",
-            "drama": "Drama",
-            "horror": "Terror",
-            "sci_fi": "Ciencia Ficción",
-            "romance": "Romance",
-            "thriller": "Suspenso",
-            "documentary": "Documental",
-            "animation": "Animación",
-            "family": "Familia"
-        },
-        "fr": {
-            "home": "Accueil",
-            "movies": "Films",
-            "series": "Séries TV",
-            "my_list": "Ma Liste",
-            "search": "Rechercher",
-            "play": "Lire",
-            "more_info": "Plus d'Infos",
-            "continue_watching": "Continuer à Regarder",
-            "popular": "Populaire",
-            "trending": "Tendances",
-            "new_releases": "Nouvelles Sorties",
-            "action": "Action",
-            "comedy": "Comédie",
-            "drama": "Drame",
-            "horror": "Horreur",
-            "sci_fi": "Science-Fiction",
-            "romance": "Romance",
-            "thriller": "Thriller",
-            "documentary": "Documentaire",
-            "animation": "Animation",
-            "family": "Famille"
-        }
+TRANSLATIONS = {
+    "en": {
+        "home": "Home",
+        "movies": "Movies",
+        "series": "TV Series",
+        "my_list": "My List",
+        "search": "Search",
+        "play": "Play",
+        "more_info": "More Info",
+        "continue_watching": "Continue Watching",
+        "popular": "Popular",
+        "trending": "Trending Now",
+        "new_releases": "New Releases",
+        "action": "Action",
+        "comedy": "Comedy",
+        "drama": "Drama",
+        "horror": "Horror",
+        "sci_fi": "Sci-Fi",
+        "romance": "Romance",
+        "thriller": "Thriller",
+        "documentary": "Documentary",
+        "animation": "Animation",
+        "family": "Family"
+    },
+    "es": {
+        "home": "Inicio",
+        "movies": "Películas",
+        "series": "Series de TV",
+        "my_list": "Mi Lista",
+        "search": "Buscar",
+        "play": "Reproducir",
+        "more_info": "Más Información",
+        "continue_watching": "Continuar Viendo",
+        "popular": "Popular",
+        "trending": "Tendencias",
+        "new_releases": "Nuevos Lanzamientos",
+        "action": "Acción",
+        "comedy": "Comedia",
+        "drama": "Drama",
+        "horror": "Terror",
+        "sci_fi": "Ciencia Ficción",
+        "romance": "Romance",
+        "thriller": "Suspenso",
+        "documentary": "Documental",
+        "animation": "Animación",
+        "family": "Familia"
+    },
+    "fr": {
+        "home": "Accueil",
+        "movies": "Films",
+        "series": "Séries TV",
+        "my_list": "Ma Liste",
+        "search": "Rechercher",
+        "play": "Lire",
+        "more_info": "Plus d'Infos",
+        "continue_watching": "Continuer à Regarder",
+        "popular": "Populaire",
+        "trending": "Tendances",
+        "new_releases": "Nouvelles Sorties",
+        "action": "Action",
+        "comedy": "Comédie",
+        "drama": "Drame",
+        "horror": "Horreur",
+        "sci_fi": "Science-Fiction",
+        "romance": "Romance",
+        "thriller": "Thriller",
+        "documentary": "Documentaire",
+        "animation": "Animation",
+        "family": "Famille"
     }
+}
+
+# Serialized once at import with a content-hash ETag; the data never changes at runtime
+TRANSLATION_RESPONSES = {}
+for _lang, _strings in TRANSLATIONS.items():
+    _body = orjson.dumps(_strings)
+    TRANSLATION_RESPONSES[_lang] = (_body, f'"{hashlib.sha256(_body).hexdigest()[:32]}"')
+
+@api_router.get("/translations")
+async def get_translations(request: Request, lang: str = "en"):
+    body, etag = TRANSLATION_RESPONSES.get(lang, TRANSLATION_RESPONSES["en"])
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400, immutable"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
     
-    return translations.get(lang, translations["en"])
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # Health check
 @api_router.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now(timezone.utc)}
+    return {"status": "healthy", "timestamp": utcnow()}
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -595,6 +841,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Movie lists are repetitive JSON (keys, categories, URL prefixes) and shrink
+# several-fold; small bodies are left as-is
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -602,6 +852,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def warm_up_db_client():
+    # Forces server selection and opens the first pooled connection before the
+    # first request arrives
+    await db.command("ping")
+
+@app.on_event("startup")
+async def create_indexes():
+    # Index the predicates of the hot query paths so they are served by IXSCAN
+    await asyncio.gather(
+        db.users.create_index("id", unique=True),
+        db.users.create_index("email", unique=True),
+        db.profiles.create_index("id", unique=True),
+        db.profiles.create_index("user_id"),
+        db.movies.create_index("id", unique=True),
+        db.movies.create_index("slug", unique=True),
+        db.movies.create_index([("category", 1), ("release_year", 1)]),
+        db.movies.create_index([("title", "text"), ("description", "text")], default_language="english"),
+        db.view_progress.create_index([("profile_id", 1), ("completed", 1), ("last_watched", -1)]),
+        db.view_progress.create_index([("profile_id", 1), ("movie_id", 1)], unique=True)
+    )
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    password_pool.shutdown(wait=False)
+
+if __name__ == "__main__":
+    import uvicorn
+    # Same settings as the production launch:
+    # WEB_CONCURRENCY=$(nproc) uvicorn server:app --loop uvloop --http httptools --limit-concurrency 1024 --backlog 4096
+    # Workers re-import this module and size password_pool from WEB_CONCURRENCY
+    os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count()))
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8001")),
+        # "auto" picks uvloop and httptools when installed (uvloop is not on Windows)
+        loop="auto",
+        http="auto",
+        workers=int(os.environ["WEB_CONCURRENCY"]),
+        limit_concurrency=1024,
+        backlog=4096
+    )
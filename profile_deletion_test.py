@@ -1,67 +1,65 @@
 #!/usr/bin/env python3
 """
 Additional test for profile deletion functionality
+
+Kept as a thin wrapper: the test lives in backend_test.StreamFlixTester and also
+runs as part of the full suite, reusing its user and profile.
+
+With vcrpy installed the HTTP traffic is replayed from fixtures/profile_deletion.yaml
+(recorded on the first run); REFRESH_FIXTURES=1 re-records it against the live API.
 """
 
-import requests
-import json
+import os
+import sys
+from pathlib import Path
+
+from backend_test import StreamFlixTester, close_session
+
+try:
+    import vcr
+except ImportError:  # vcrpy is optional; without it the test always hits the live API
+    vcr = None
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
-BASE_URL = "https://watchflix-449.preview.emergentagent.com/api"
+def with_cassette(name: str):
+    """Record/replay the decorated test's HTTP calls in fixtures/<name>.yaml"""
+    if vcr is None:
+        return lambda test: test
+    recorder = vcr.VCR(
+        cassette_library_dir=str(FIXTURES_DIR),
+        record_mode="all" if os.getenv("REFRESH_FIXTURES") == "1" else "new_episodes",
+        # Profile IDs differ between recordings, but replayed responses supply
+        # the IDs used in later paths, so method + URL path is enough to match
+        match_on=["method", "scheme", "host", "path"],
+        filter_headers=["authorization"],
+        filter_post_data_parameters=["password"]
+    )
+    return recorder.use_cassette(f"{name}.yaml")
 
+@with_cassette("profile_deletion")
 def test_profile_deletion():
-    print("🗑️ Testing Profile Deletion...")
-    
-    # Login as test user
-    login_data = {
-        "email": "test@example.com",
-        "password": "test123"
-    }
-    
-    response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
-    if response.status_code != 200:
-        print("❌ Failed to login")
-        return False
-    
-    token = response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Create two profiles
-    profile1_data = {"name": "Profile 1", "avatar": "default"}
-    profile2_data = {"name": "Profile 2", "avatar": "default"}
-    
-    response1 = requests.post(f"{BASE_URL}/profiles", json=profile1_data, headers=headers)
-    response2 = requests.post(f"{BASE_URL}/profiles", json=profile2_data, headers=headers)
-    
-    if response1.status_code != 200 or response2.status_code != 200:
-        print("❌ Failed to create profiles")
-        return False
-    
-    profile1_id = response1.json()["id"]
-    profile2_id = response2.json()["id"]
-    
-    print(f"✅ Created profiles: {profile1_id}, {profile2_id}")
-    
-    # Delete one profile
-    response = requests.delete(f"{BASE_URL}/profiles/{profile1_id}", headers=headers)
-    
-    if response.status_code == 200:
-        print("✅ Profile deleted successfully")
-        
-        # Verify profile list
-        response = requests.get(f"{BASE_URL}/profiles", headers=headers)
-        if response.status_code == 200:
-            profiles = response.json()
-            if len(profiles) == 2:  # Should have 2 profiles (1 from main test + 1 remaining)
-                print(f"✅ Profile count correct: {len(profiles)} profiles remaining")
-                return True
-            else:
-                print(f"❌ Expected 2 profiles, found {len(profiles)}")
-        else:
-            print("❌ Failed to get profiles list")
-    else:
-        print(f"❌ Failed to delete profile: {response.status_code}")
-    
-    return False
+    """Standalone entry point; the check itself is StreamFlixTester.test_profile_deletion"""
+    tester = StreamFlixTester()
+    try:
+        # Only the setup the deletion test needs: a user, its main profile and one
+        # profile to delete. The suite's pooled profiles are created in parallel,
+        # so which one gets claimed would not replay deterministically.
+        if not (tester.test_user_registration() and tester.test_create_profile()):
+            return False
+        success, response, data, error = tester.make_request(
+            "POST", "/profiles", {"name": "Profile To Delete", "avatar": "default"}, tester._user_hdr
+        )
+        if not success or response.status_code != 200:
+            tester.log_result("Profile Deletion", False, f"Failed to create profile: {response.status_code if response else error}")
+            return False
+        return tester.test_profile_deletion(data["id"])
+    finally:
+        tester.flush()
 
 if __name__ == "__main__":
-    test_profile_deletion()
\ No newline at end of file
+    try:
+        success = test_profile_deletion()
+    finally:
+        close_session()
+    sys.exit(0 if success else 1)